@@ -3,12 +3,20 @@ from __future__ import annotations
 import contextlib
 from pathlib import Path
 
-from ews_gis_assets.austro_control import get_austro_control_data
-from ews_gis_assets.helpers import is_data_updated
+from ews_gis_assets import austro_control
+from ews_gis_assets.helpers import (
+    calculate_code_hash,
+    calculate_source_hash,
+    check_source_modified,
+    is_source_updated,
+    publish_dataset,
+    save_source_validators,
+)
 
 OUTPUT_DIR = Path("data")
 FILE_NAME = "austro_control_icao"
 HASH_FILE = OUTPUT_DIR / f"{FILE_NAME}.hash"
+META_FILE = OUTPUT_DIR / f".{FILE_NAME}_meta.json"
 
 
 def main():
@@ -16,32 +24,39 @@ def main():
     if not OUTPUT_DIR.exists():
         OUTPUT_DIR.mkdir(parents=True)
 
-    # Download the GeoJSON file
-    gdf, filename = get_austro_control_data(data_path=OUTPUT_DIR)
-
-    if filename and filename.is_file():
-        with contextlib.suppress(OSError):
-            filename.unlink()
-
-    if gdf is None:
-        raise RuntimeError("Failed to download Austro Control data.")
-
-    # Check if data has changed (once for all formats)
-    if not is_data_updated(gdf, HASH_FILE):
+    # Revalidate the latest archive before downloading and parsing it
+    code_hash = calculate_code_hash(austro_control)
+    link = austro_control.get_austro_control_links()[0]
+    checked = check_source_modified(link[1], META_FILE, code_hash)
+    if checked is None:
         print("No changes detected. Exiting without saving files.")
         return
-
-    # Save data to local files in multiple formats
-    save_exts = [
-        (".geojson", "GeoJSON"),
-        (".gpkg", "GPKG"),
-    ]
-    for suffix, driver in save_exts:
-        file_path = OUTPUT_DIR / f"{FILE_NAME}{suffix}"
-        gdf.to_file(file_path, driver=driver)
-        print(f"Saved {driver} file: {file_path}")
-
-    print("Changes detected. Files updated and can be pushed to the repository.")
+    validators, resp = checked
+
+    # Extract the XML from the revalidation request's body
+    with resp:
+        publication_date, ac_source, filename = austro_control.download_austro_control_xml(
+            data_path=OUTPUT_DIR, link=link, resp=resp
+        )
+    try:
+        if ac_source is None:
+            raise RuntimeError("Failed to download Austro Control data.")
+
+        # Skip parsing + frame hashing when the raw XML is unchanged
+        src_sha = calculate_source_hash(ac_source, code_hash, publication_date)
+        if not is_source_updated(src_sha, HASH_FILE):
+            print("No changes detected. Exiting without saving files.")
+            return
+
+        gdf = austro_control.parse_icao(ac_source)
+        gdf["PublicationDate"] = publication_date
+    finally:
+        if filename and filename.is_file():
+            with contextlib.suppress(OSError):
+                filename.unlink()
+
+    if publish_dataset(gdf, OUTPUT_DIR, FILE_NAME, src_sha):
+        save_source_validators(validators, META_FILE)
 
 
 if __name__ == "__main__":
@@ -2,41 +2,50 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from ews_gis_assets.helpers import is_data_updated
-from ews_gis_assets.noe import download_noe_geojson
+from ews_gis_assets import noe
+from ews_gis_assets.constants import NOE_GEOJSON_URL
+from ews_gis_assets.helpers import (
+    calculate_code_hash,
+    calculate_source_hash,
+    check_source_modified,
+    is_source_updated,
+    publish_dataset,
+    save_source_validators,
+)
 
 OUTPUT_DIR = Path("data")
 FILE_NAME = "windkraftanlagen"
 HASH_FILE = OUTPUT_DIR / f"{FILE_NAME}.hash"
+META_FILE = OUTPUT_DIR / f".{FILE_NAME}_meta.json"
 
 
 def main():
     """Main method for the script."""
-    if not OUTPUT_DIR.exists():
-        OUTPUT_DIR.mkdir(parents=True)
-
-    # Download the GeoJSON file
-    gdf = download_noe_geojson()
+    code_hash = calculate_code_hash(noe)
+    checked = check_source_modified(NOE_GEOJSON_URL, META_FILE, code_hash)
+    if checked is None:
+        print("No changes detected. Exiting without saving files.")
+        return
+    validators, resp = checked
 
-    if gdf is None:
+    # Read the GeoJSON body of the revalidation request
+    with resp:
+        content = noe.fetch_noe_geojson(resp)
+    if content is None:
         raise RuntimeError("Failed to download NOE GeoJSON data.")
 
-    # Check if data has changed (once for all formats)
-    if not is_data_updated(gdf, HASH_FILE):
+    # Skip parsing + frame hashing when the raw response is unchanged
+    src_sha = calculate_source_hash(content, code_hash)
+    if not is_source_updated(src_sha, HASH_FILE):
         print("No changes detected. Exiting without saving files.")
         return
 
-    # Save data to local files in multiple formats
-    save_exts = [
-        (".geojson", "GeoJSON"),
-        (".gpkg", "GPKG"),
-    ]
-    for suffix, driver in save_exts:
-        file_path = OUTPUT_DIR / f"{FILE_NAME}{suffix}"
-        gdf.to_file(file_path, driver=driver)
-        print(f"Saved {driver} file: {file_path}")
-
-    print("Changes detected. Files updated and can be pushed to the repository.")
+    gdf = noe.parse_noe_geojson(content)
+    if gdf is None:
+        raise RuntimeError("Failed to parse NOE GeoJSON data.")
+
+    if publish_dataset(gdf, OUTPUT_DIR, FILE_NAME, src_sha):
+        save_source_validators(validators, META_FILE)
 
 
 if __name__ == "__main__":
@@ -1,16 +1,44 @@
 from __future__ import annotations
 
 import io
-import operator
-import xml.etree.ElementTree as ET
+import re
+import shutil
+import tempfile
 import zipfile
 from pathlib import Path
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
 import pyproj
 import requests
 from bs4 import BeautifulSoup
+from lxml import etree
+
+_AIXM = "{http://www.aixm.aero/schema/5.1.1}"
+_GML = "{http://www.opengis.net/gml/3.2}"
+
+_VS = f"{_AIXM}VerticalStructure"
+_VSP = f"{_AIXM}VerticalStructurePart"
+_TYPE = f"{_AIXM}type"
+_NAME = f"{_AIXM}name"
+_CONSTRUCTION_STATUS = f"{_AIXM}constructionStatus"
+_NOTE_ELEM = f"{_AIXM}Note"
+_NOTE = f"{_AIXM}note"
+_NOTE_PATH = f".//{_NOTE}"
+_VERTICAL_EXTENT = f"{_AIXM}verticalExtent"
+_VERTICAL_ACCURACY = f"{_AIXM}verticalExtentAccuracy"
+_HORIZONTAL_ACCURACY = f"{_AIXM}horizontalAccuracy"
+_ELEVATION = f"{_AIXM}elevation"
+_POS = f"{_GML}pos"
+_GML_ID = f"{_GML}id"
+
+_NAME_PREFIX = re.compile(r"Windpark |WP |WKA |Windturbine |Windkraftanlage ")
+
+_VS_TAGS = frozenset({_TYPE, _NAME, _CONSTRUCTION_STATUS, _NOTE_ELEM})
+_VSP_TAGS = frozenset(
+    {_VERTICAL_EXTENT, _VERTICAL_ACCURACY, _HORIZONTAL_ACCURACY, _POS, _ELEVATION, _TYPE}
+)
 
 
 def get_austro_control_links() -> list[str, str]:
@@ -34,58 +62,69 @@ def get_austro_control_links() -> list[str, str]:
 
 
 def clean_name(s):
-    if s.startswith("Windpark "):
-        return s.replace("Windpark ", "").strip()
-    if s.startswith("WP "):
-        return s.replace("WP ", "").strip()
-    if s.startswith("WKA "):
-        return s.replace("WKA ", "").strip()
-    if s.startswith("Windturbine "):
-        return s.replace("Windturbine ", "").strip()
-    if s.startswith("Windkraftanlage"):
-        return s.replace("Windkraftanlage ", "").strip()
+    # Trailing space required: "Windkraftanlagen Soboth" is a real name, not a prefix.
+    # Every occurrence of the matched prefix is dropped, as str.replace always did.
+    m = _NAME_PREFIX.match(s)
+    if m is not None:
+        s = s.replace(m.group(), "")
     return s.strip()
 
 
-def parse_icao(data: str | bytes) -> gpd.GeoDataFrame:
-    root = ET.fromstring(data)
+def _first_of(elem, tags: frozenset[str]) -> dict:
+    """First descendant per tag, in document order — what `.find(".//tag")` returns.
+
+    One walk over the subtree replaces a separate `.//` search per field.
+    """
+    found = {}
+    for child in elem.iter(*tags):
+        if child.tag not in found:
+            found[child.tag] = child
+    return found
 
-    structs = list(root.iter(tag="{http://www.aixm.aero/schema/5.1.1}VerticalStructure"))
+
+def parse_icao(data: str | bytes | Path) -> gpd.GeoDataFrame:
+    # Stream the file and drop each VerticalStructure once read, so a large
+    # obstacle file never sits in memory as a full tree. Given a Path, lxml
+    # reads the file itself and the XML is never held as one bytes object.
     wtgs = []
+    lats, lons = [], []
     valid_types = {"WINDMILL_FARMS", "WINDMILL"}
-    for part in structs:
-        p_type = part.find(".//{http://www.aixm.aero/schema/5.1.1}type").text
-        if p_type not in valid_types:
-            continue
-        status = part.find(".//{http://www.aixm.aero/schema/5.1.1}constructionStatus").text.strip()
-        wp_name = part.find(".//{http://www.aixm.aero/schema/5.1.1}name").text
-        wp_name2 = clean_name(
-            part.find(".//{http://www.aixm.aero/schema/5.1.1}Note")
-            .find(".//{http://www.aixm.aero/schema/5.1.1}note")
-            .text
-        )
-
-        for wtg in part.findall(".//{http://www.aixm.aero/schema/5.1.1}VerticalStructurePart"):
-            wtgs.append(
-                {
-                    "WindFarm": wp_name2,
-                    "WPID": wp_name,
-                    "Name": dict(wtg.items())["{http://www.opengis.net/gml/3.2}id"],
-                    "VerticalExtent": wtg.find(
-                        ".//{http://www.aixm.aero/schema/5.1.1}verticalExtent"
-                    ).text,
-                    "VerticalAccuracy": wtg.find(
-                        ".//{http://www.aixm.aero/schema/5.1.1}verticalExtentAccuracy"
-                    ).text,
-                    "HorizontalAccuracy": wtg.find(
-                        ".//{http://www.aixm.aero/schema/5.1.1}horizontalAccuracy"
-                    ).text,
-                    "geometry": wtg.find(".//{http://www.opengis.net/gml/3.2}pos").text.split(" "),
-                    "Status": status,
-                    "Elevation": wtg.find(".//{http://www.aixm.aero/schema/5.1.1}elevation").text,
-                    "Type": wtg.find(".//{http://www.aixm.aero/schema/5.1.1}type").text,
-                }
-            )
+    if isinstance(data, Path):
+        source = str(data)
+    else:
+        source = io.BytesIO(data.encode("utf-8") if isinstance(data, str) else data)
+    for _, struct in etree.iterparse(source, events=("end",), tag=_VS):
+        found = _first_of(struct, _VS_TAGS)
+        if found[_TYPE].text in valid_types:
+            status = found[_CONSTRUCTION_STATUS].text.strip()
+            wp_name = found[_NAME].text
+            wp_name2 = clean_name(found[_NOTE_ELEM].find(_NOTE_PATH).text)
+
+            for wtg in struct.iter(_VSP):
+                part = _first_of(wtg, _VSP_TAGS)
+                # gml:pos is "lat lon [h]" (EPSG:4326 axis order)
+                coords = part[_POS].text.split()
+                lats.append(float(coords[0]))
+                lons.append(float(coords[1]))
+                wtgs.append(
+                    {
+                        "WindFarm": wp_name2,
+                        "WPID": wp_name,
+                        "Name": wtg.attrib[_GML_ID],
+                        "VerticalExtent": part[_VERTICAL_EXTENT].text,
+                        "VerticalAccuracy": part[_VERTICAL_ACCURACY].text,
+                        "HorizontalAccuracy": part[_HORIZONTAL_ACCURACY].text,
+                        "Status": status,
+                        "Elevation": part[_ELEVATION].text,
+                        "Type": part[_TYPE].text,
+                    }
+                )
+
+        # Also drop the processed siblings, including their message:hasMember wrappers.
+        struct.clear()
+        for node in (struct, struct.getparent()):
+            while node is not None and node.getprevious() is not None:
+                del node.getparent()[0]
 
     df = pd.DataFrame.from_records(wtgs)
     df["UID"] = df["Name"].str.split("_", expand=True).iloc[:, 1].astype("int")
@@ -95,15 +134,14 @@ def parse_icao(data: str | bytes) -> gpd.GeoDataFrame:
         "VerticalExtent",
         "VerticalAccuracy",
     ]:
-        df[col] = df[col].apply(pd.to_numeric, errors="coerce")
+        df[col] = pd.to_numeric(df[col], errors="coerce")
 
     df["TerrainElevation"] = (df["Elevation"] - df["VerticalExtent"]).round(1)
-    df["geometry"] = gpd.points_from_xy(
-        df["geometry"].apply(operator.itemgetter(1)),
-        df["geometry"].apply(operator.itemgetter(0)),
-    )
-    df["Longitude"] = [_.x for _ in df.geometry]
-    df["Latitude"] = [_.y for _ in df.geometry]
+    lon = np.asarray(lons, dtype=np.float64)
+    lat = np.asarray(lats, dtype=np.float64)
+    df["geometry"] = gpd.points_from_xy(lon, lat)
+    df["Longitude"] = lon
+    df["Latitude"] = lat
     rd = {
         "COMPLETED": "Operating",
         "IN_CONSTRUCTION": "UnderConstruction",
@@ -118,7 +156,8 @@ def parse_icao(data: str | bytes) -> gpd.GeoDataFrame:
         "OTHER:MODIFICATION_PLANNED": "ModificationPlanned",
         "OTHER:CONSTRUCTION_APPRVD": "Approved",
     }
-    df["Status"] = df["Status"].fillna("").apply(lambda _: rd.get(_, _))
+    status = df["Status"].fillna("")
+    df["Status"] = status.map(rd).fillna(status)
 
     df = gpd.GeoDataFrame(df)
     df.crs = pyproj.crs.crs.CRS.from_epsg(4326)
@@ -151,9 +190,34 @@ def get_austro_control_data(
     Retrieve the Hindernisdatensatz dataframe.
     list_index specifies with index to use in the list retrieved from get_bev_links_for_scale
     """
-    urls = get_austro_control_links()
-    assert list_index < len(urls)
-    publication_date, url = urls[list_index]
+    publication_date, ac_source, filename = download_austro_control_xml(
+        data_path=data_path, list_index=list_index, overwrite=overwrite
+    )
+    df_austro = parse_icao(ac_source)
+    df_austro["PublicationDate"] = publication_date
+    return df_austro, filename
+
+
+def download_austro_control_xml(
+    data_path: Path | None = None,
+    list_index: int = 0,
+    overwrite: bool = False,
+    link: tuple[str, str] | None = None,
+    resp: requests.Response | None = None,
+) -> tuple[str, bytes | Path | None, Path | None]:
+    """
+    Fetch the Hindernisdatensatz XML without parsing it, so callers can hash the source first.
+    Returns (publication_date, XML bytes or cached file, cache filename); the XML is None
+    when the download failed.
+    `link` is a (publication_date, url) pair already taken from get_austro_control_links, and
+    `resp` an unread streamed response for its url (see `check_source_modified`); either
+    spares a repeated request.
+    """
+    if link is None:
+        urls = get_austro_control_links()
+        assert list_index < len(urls)
+        link = urls[list_index]
+    publication_date, url = link
 
     print(f"Requesting {str(Path(url).name)!r} ({publication_date})")
 
@@ -171,22 +235,38 @@ def get_austro_control_data(
     if ((filename is None) or (not filename.is_file())) or overwrite:
         print(f"Getting Obstacle dataset (ICAO) from {url!s}")
         try:
-            resp = requests.get(url)
-            with zipfile.ZipFile(io.BytesIO(resp.content)) as zin:
-                files = [_ for _ in zin.namelist() if _.endswith(".xml")]
-                if len(files) == 1:
-                    ac_source = zin.read(files[0])
+            # Spool the archive (to disk past 64 MiB) instead of buffering resp.content;
+            # ZipFile needs a seekable file, which resp.raw is not.
+            if resp is None:
+                resp = requests.get(url, stream=True, timeout=180)
+            with resp, tempfile.SpooledTemporaryFile(max_size=64 << 20) as spool:
+                for chunk in resp.iter_content(chunk_size=1 << 20):
+                    spool.write(chunk)
+                spool.seek(0)
+                with zipfile.ZipFile(spool) as zin:
+                    files = [_ for _ in zin.namelist() if _.endswith(".xml")]
+                    if len(files) == 1:
+                        if isinstance(filename, Path):
+                            # zipfile checks the CRC only at the end of the stream: extract
+                            # beside the cache file and rename it into place once complete,
+                            # so a corrupt archive never leaves a truncated cache behind.
+                            partial = filename.with_suffix(".xml.part")
+                            try:
+                                with zin.open(files[0]) as src, partial.open("wb") as dst:
+                                    shutil.copyfileobj(src, dst, 1 << 20)
+                                partial.replace(filename)
+                            finally:
+                                partial.unlink(missing_ok=True)
+                            ac_source = filename
+                        else:
+                            ac_source = zin.read(files[0])
             if ac_source is None:
                 raise RuntimeError("Could not fetch Obstacle dataset (ICAO)")
-            if isinstance(filename, Path):
-                filename.write_bytes(ac_source)
         except Exception as e:
             ac_source = None
             print(str(e))
     else:
         print(f"Using existing file {str(filename.name)!r}")
-        ac_source = filename.read_bytes()
+        ac_source = filename
 
-    df_austro = parse_icao(ac_source)
-    df_austro["PublicationDate"] = publication_date
-    return df_austro, filename
+    return publication_date, ac_source, filename
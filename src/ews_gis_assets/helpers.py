@@ -1,12 +1,18 @@
 from __future__ import annotations
 
 import hashlib
+import json
 from pathlib import Path
+from types import ModuleType
 
 import geopandas as gpd
 import pandas as pd
+import pyogrio
+import requests
 from folium import Map
 
+_SQLITE_BULK_WRITE = {"OGR_SQLITE_SYNCHRONOUS": "OFF", "OGR_SQLITE_JOURNAL": "MEMORY"}
+
 
 def show_folium_safe(m: Map, height=500):
     """
@@ -46,54 +52,154 @@ def calculate_file_hash(file_path: Path) -> str:
 
 def calculate_geodata_hash(file_path: Path) -> str:
     """Calculate a content hash for geodata files (GPKG, GeoJSON) ignoring metadata."""
-    gdf = gpd.read_file(file_path)
-    # Hash the actual data content using pandas hash_pandas_object
-    # This ignores file metadata and only hashes the actual data
-    content_hash = pd.util.hash_pandas_object(gdf, index=True).sum()
-    return str(content_hash)
+    # Hash the actual data content, so file metadata does not count as a change
+    return calculate_gdf_hash(gpd.read_file(file_path))
 
 
 def calculate_gdf_hash(gdf: gpd.GeoDataFrame) -> str:
-    """Calculate a content hash for a GeoDataFrame."""
-    content_hash = pd.util.hash_pandas_object(gdf, index=True).sum()
-    return str(content_hash)
+    """Calculate a content hash for a GeoDataFrame.
+
+    SHA-256 over the per-row pandas hashes, fed as one buffer. Unlike their sum
+    it is order-sensitive and cannot cancel out. Raw column bytes are not used:
+    for object columns those are pointers, not content.
+    """
+    row_hashes = pd.util.hash_pandas_object(gdf, index=True).to_numpy()
+    return hashlib.sha256(row_hashes).hexdigest()
+
+
+def calculate_code_hash(module: ModuleType) -> str:
+    """SHA-256 of the module that cleans a source.
+
+    The source-level gates fold this in, so fixing a downloader / cleaner still
+    forces a rebuild while the upstream payload itself is unchanged. Hashes are only
+    saved when files are published, so after an edit that leaves the frame unchanged
+    those gates stay off until the upstream data changes.
+    """
+    return calculate_file_hash(Path(module.__file__))
+
+
+def calculate_source_hash(source: bytes | Path, *extra: str) -> str:
+    """SHA-256 of a raw upstream payload, plus anything else that shapes the frame."""
+    hash_sha256 = hashlib.sha256()
+    for part in extra:
+        hash_sha256.update(part.encode("utf-8"))
+    if isinstance(source, Path):
+        with source.open("rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                hash_sha256.update(chunk)
+    else:
+        hash_sha256.update(source)
+    return hash_sha256.hexdigest()
+
+
+def _read_hashes(hash_file: Path) -> dict[str, str]:
+    """Hashes recorded at the last publish; older sidecars hold only the bare frame hash."""
+    if not hash_file.exists():
+        return {}
+    text = hash_file.read_text().strip()
+    try:
+        hashes = json.loads(text)
+    except ValueError:
+        hashes = None
+    return hashes if isinstance(hashes, dict) else {"gdf_hash": text}
+
+
+def is_source_updated(src_sha: str, hash_file: Path) -> bool:
+    """Cheap pre-check before parsing: False when the raw source matches the last publish."""
+    if _read_hashes(hash_file).get("src_sha") == src_sha:
+        print("Source is identical to the previous version. No update needed.")
+        return False
+    return True
 
 
-def is_data_updated(gdf: gpd.GeoDataFrame, hash_file: Path) -> bool:
-    """Check if the GeoDataFrame differs from the previous version."""
+def is_data_updated(gdf: gpd.GeoDataFrame, hash_file: Path, src_sha: str | None = None) -> bool:
+    """Check if the GeoDataFrame differs from the previous version.
+
+    `src_sha` is only recorded when the frame changed: a source that churns without
+    changing the frame would otherwise commit a new sidecar on every run.
+    """
     new_hash = calculate_gdf_hash(gdf)
 
     print(f"Using hash file: {hash_file}")
 
-    # Check if the hash file exists
-    if hash_file.exists():
-        with hash_file.open("r") as f:
-            last_hash = f.read().strip()
-            if new_hash == last_hash:
-                print("Data is identical to the previous version. No update needed.")
-                return False
+    if _read_hashes(hash_file).get("gdf_hash") == new_hash:
+        print("Data is identical to the previous version. No update needed.")
+        return False
 
-    # Save the new hash for future comparisons
-    with hash_file.open("w") as f:
-        f.write(new_hash)
+    # Save the new hashes for future comparisons
+    hashes = (
+        {"gdf_hash": new_hash} if src_sha is None else {"src_sha": src_sha, "gdf_hash": new_hash}
+    )
+    hash_file.write_text(json.dumps(hashes, indent=2) + "\n")
     print("New data detected. Updating files...")
     return True
 
 
-def publish_dataset(gdf: gpd.GeoDataFrame, output_dir: Path, file_name: str) -> bool:
+def check_source_modified(
+    url: str, meta_file: Path, code_hash: str | None = None
+) -> tuple[dict[str, str], requests.Response] | None:
+    """Conditional GET of `url` against the ETag / Last-Modified saved in `meta_file`.
+
+    Returns None on 304 Not Modified. Otherwise returns the response's validators and
+    the streamed, still unread response; the downloader consumes (and closes) it, so
+    the source is fetched once. Hand the validators to `save_source_validators` once
+    the run is done, so a source that changes its validators but not its content never
+    commits on its own. Saved validators are ignored when `code_hash` (see
+    `calculate_code_hash`) differs.
+    """
+    meta_file = Path(meta_file)
+    saved = json.loads(meta_file.read_text()) if meta_file.exists() else {}
+    headers = {}
+    if saved.get("url") == url and saved.get("code_hash") == code_hash:
+        if "ETag" in saved:
+            headers["If-None-Match"] = saved["ETag"]
+        if "Last-Modified" in saved:
+            headers["If-Modified-Since"] = saved["Last-Modified"]
+
+    # stream=True: only the headers are read here, the body is left to the downloader
+    resp = requests.get(url, headers=headers, timeout=180, stream=True)
+    if resp.status_code == 304:
+        resp.close()
+        print(f"Source not modified since last publish: {url}")
+        return None
+    try:
+        resp.raise_for_status()
+    except requests.HTTPError:
+        resp.close()
+        raise
+    validators = {k: resp.headers[k] for k in ("ETag", "Last-Modified") if k in resp.headers}
+    return {"url": url, "code_hash": code_hash, **validators}, resp
+
+
+def save_source_validators(validators: dict[str, str], meta_file: Path) -> None:
+    """Persist validators from `check_source_modified`; skipped if the server sent none."""
+    if "ETag" in validators or "Last-Modified" in validators:
+        Path(meta_file).write_text(json.dumps(validators, indent=2) + "\n")
+
+
+def publish_dataset(
+    gdf: gpd.GeoDataFrame, output_dir: Path, file_name: str, src_sha: str | None = None
+) -> bool:
     """Hash-gate then write GeoJSON + GPKG. Returns True when files were written."""
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
     hash_file = output_dir / f"{file_name}.hash"
 
-    if not is_data_updated(gdf, hash_file):
+    if not is_data_updated(gdf, hash_file, src_sha):
         print("No changes detected. Exiting without saving files.")
         return False
 
-    for suffix, driver in ((".geojson", "GeoJSON"), (".gpkg", "GPKG")):
-        file_path = output_dir / f"{file_name}{suffix}"
-        gdf.to_file(file_path, driver=driver)
-        print(f"Saved {driver} file: {file_path}")
+    # Both formats are written from the frame: a GPKG round-trip tags naive datetimes as UTC.
+    # Each file is rebuilt from scratch, so SQLite's fsyncs and journal guard nothing.
+    pyogrio.set_gdal_config_options(_SQLITE_BULK_WRITE)
+    try:
+        for suffix, driver in ((".geojson", "GeoJSON"), (".gpkg", "GPKG")):
+            file_path = output_dir / f"{file_name}{suffix}"
+            file_path.unlink(missing_ok=True)
+            gdf.to_file(file_path, driver=driver, engine="pyogrio", use_arrow=True)
+            print(f"Saved {driver} file: {file_path}")
+    finally:
+        pyogrio.set_gdal_config_options(dict.fromkeys(_SQLITE_BULK_WRITE))
 
     print("Changes detected. Files updated and can be pushed to the repository.")
     return True
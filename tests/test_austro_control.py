@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ews_gis_assets.austro_control import parse_icao
+from ews_gis_assets.helpers import calculate_gdf_hash
+
+FIXTURE = Path(__file__).parent / "data" / "austro_control_icao.xml"
+
+# Pinned so a parser change that alters the published frame fails loudly
+FIXTURE_GDF_HASH = "62d3f8a2347e3837ff3b1f1ded62cad4993a0098169de0fcace0b37035428548"
+
+
+@pytest.mark.parametrize(
+    "source",
+    [FIXTURE, FIXTURE.read_bytes(), FIXTURE.read_text(encoding="utf-8")],
+    ids=["path", "bytes", "str"],
+)
+def test_parse_icao(source):
+    gdf = parse_icao(source)
+
+    assert list(gdf.columns) == [
+        "Name",
+        "WPID",
+        "WindFarm",
+        "HorizontalAccuracy",
+        "TerrainElevation",
+        "Elevation",
+        "VerticalExtent",
+        "VerticalAccuracy",
+        "Type",
+        "Status",
+        "geometry",
+        "Longitude",
+        "Latitude",
+        "UID",
+    ]
+    assert gdf.crs.to_epsg() == 4326
+
+    # The TOWER structure between the two wind structures is skipped
+    assert gdf["Name"].tolist() == ["vsp_11", "vsp_12", "vsp_31"]
+    assert gdf["WPID"].tolist() == ["LO_ODS_000001", "LO_ODS_000001", "LO_ODS_000003"]
+    assert gdf["UID"].tolist() == [11, 12, 31]
+    # "Windkraftanlagen" is a name, not the "Windkraftanlage " prefix
+    assert gdf["WindFarm"].tolist() == [
+        "Windkraftanlagen Soboth",
+        "Windkraftanlagen Soboth",
+        "Hochwald",
+    ]
+    # Mapped status is renamed, unmapped status passes through
+    assert gdf["Status"].tolist() == ["Operating", "Operating", "OTHER:REMOVED"]
+    assert gdf["Type"].tolist() == [None, "WINDTURBINE", None]
+
+    # xsi:nil accuracies become NaN
+    np.testing.assert_array_equal(gdf["HorizontalAccuracy"], [np.nan, 5.0, np.nan])
+    np.testing.assert_array_equal(gdf["VerticalAccuracy"], [np.nan, 2.5, np.nan])
+    np.testing.assert_array_equal(gdf["TerrainElevation"], [1310.5, 1261.0, 866.5])
+
+    # gml:pos is "lat lon [h]"; the 3-value position drops its height
+    np.testing.assert_array_equal(gdf["Latitude"], [46.70512345, 46.70698765, 48.41008218])
+    np.testing.assert_array_equal(gdf["Longitude"], [15.01234567, 15.01567891, 15.23490562])
+    np.testing.assert_array_equal(gdf.geometry.x, gdf["Longitude"])
+    np.testing.assert_array_equal(gdf.geometry.y, gdf["Latitude"])
+
+    assert calculate_gdf_hash(gdf) == FIXTURE_GDF_HASH
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import json
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import Point
+
+from ews_gis_assets.helpers import (
+    calculate_gdf_hash,
+    calculate_source_hash,
+    is_data_updated,
+    is_source_updated,
+    save_source_validators,
+)
+
+
+@pytest.fixture
+def gdf() -> gpd.GeoDataFrame:
+    return gpd.GeoDataFrame(
+        {"Name": ["a", "b"], "Height": [120.5, 200.0]},
+        geometry=[Point(16.3, 48.2), Point(15.4, 47.1)],
+        crs="EPSG:4326",
+    )
+
+
+def test_legacy_bare_hash_sidecar_is_read(gdf, tmp_path):
+    hash_file = tmp_path / "x.hash"
+    hash_file.write_text(calculate_gdf_hash(gdf))
+
+    assert not is_data_updated(gdf, hash_file)
+    assert is_source_updated("sha", hash_file)
+
+
+def test_unchanged_source_short_circuits(gdf, tmp_path):
+    hash_file = tmp_path / "x.hash"
+    assert is_data_updated(gdf, hash_file, "sha-1")
+
+    assert not is_source_updated("sha-1", hash_file)
+    assert is_source_updated("sha-2", hash_file)
+
+
+def test_unchanged_frame_does_not_rewrite_sidecar(gdf, tmp_path):
+    hash_file = tmp_path / "x.hash"
+    assert is_data_updated(gdf, hash_file, "sha-1")
+    before = hash_file.read_text()
+
+    # Source churned without changing the frame: nothing to commit
+    assert not is_data_updated(gdf, hash_file, "sha-2")
+    assert hash_file.read_text() == before
+
+
+def test_code_change_without_frame_change_does_not_rewrite_sidecar(gdf, tmp_path):
+    hash_file = tmp_path / "x.hash"
+    assert is_data_updated(gdf, hash_file, calculate_source_hash(b"payload", "code-1"))
+    before = hash_file.read_text()
+
+    # A cleaner edit changes src_sha; an identical frame still must not commit
+    src_sha = calculate_source_hash(b"payload", "code-2")
+    assert is_source_updated(src_sha, hash_file)
+    assert not is_data_updated(gdf, hash_file, src_sha)
+    assert hash_file.read_text() == before
+
+
+def test_validators_not_saved_when_server_sent_none(tmp_path):
+    meta_file = tmp_path / "meta.json"
+    save_source_validators({"url": "u", "code_hash": "code-1"}, meta_file)
+    assert not meta_file.exists()
+
+    save_source_validators({"url": "u", "code_hash": "code-1", "ETag": '"1"'}, meta_file)
+    assert json.loads(meta_file.read_text())["ETag"] == '"1"'
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ews_gis_assets.noe import parse_noe_geojson
+
+PROPERTIES = {
+    "_fulltext": "x",
+    "_title": "t",
+    "_zoomscale": 1,
+    "Kennzeichen (UVP)": "",
+    "Kennzeichen (ER)": "WST1-EEA-1/001-2025",
+    "Rechtsmaterie": "  NÖ ElWG ",
+    "Betreiber": "  Windkraft GmbH ",
+    "Vorhaben": "Windpark B",
+    "Datum Genehmigungsantrag": "08.09.2025",
+    "Datum Entscheidung 1. Instanz (Bescheid)": None,
+    "Datum Fertigstellungsmeldung": None,
+    "Status": "Beantragt",
+    "Änderung": "",
+    "Repowering": "Nein",
+    "Name der WKA": "WKA 2",
+    "Leistung der WKA [MW]": "5,56",
+    "Gesamtleistung [MW]": "11,12",
+    "Gesamthöhe der WKA [m]": "246,6",
+    "Type": "Enercon E-160 EP5 E",
+    "Grundstücks-Nummer": "590/2",
+    "Katastralgemeinde": "Oberwagram",
+    "Gemeinde": "St. Pölten",
+    "Bezirk": "St. Pölten-Stadt",
+    "Hauptregion": "NÖ Mitte",
+    "KG-Nummer": 19598,
+    "Koordinaten Länge [WGS 84]": "15,668572",
+    "Koordinaten Breite [WGS 84]": "48,202875",
+    "Zusatzinformation": "",
+    "Stand": "08.08.2026",
+}
+
+
+def _feature(lon, lat, **properties):
+    geometry = None if lon is None else {"type": "Point", "coordinates": [lon, lat]}
+    return {"type": "Feature", "geometry": geometry, "properties": PROPERTIES | properties}
+
+
+def _payload(*features) -> bytes:
+    return json.dumps({"type": "FeatureCollection", "features": list(features)}).encode()
+
+
+def test_parse_noe_geojson():
+    content = _payload(
+        _feature(15.668571867, 48.202875203),
+        _feature(
+            15.7, 48.3, **{"Name der WKA": " WKA 1 ", "Datum Fertigstellungsmeldung": "01.02.2026"}
+        ),
+        # Duplicate key of the first feature: dropped, the first occurrence is kept
+        _feature(15.668571867, 48.202875203, Stand="09.08.2026"),
+        _feature(None, None, Vorhaben="Windpark A", **{"Name der WKA": "WKA 1"}),
+    )
+    gdf = parse_noe_geojson(content)
+
+    assert gdf.crs.to_epsg() == 4326
+    assert "_fulltext" not in gdf.columns
+    assert gdf.columns[-1] == "geometry"
+
+    dtypes = gdf.dtypes.astype("str")
+    assert dtypes["Rechtsmaterie"] == "category"
+    assert dtypes["Datum Genehmigungsantrag"] == "datetime64[ns]"
+    assert dtypes["Leistung der WKA [MW]"] == "float64"
+    assert dtypes["KG-Nummer"] == "int64"
+    assert dtypes["geometry"] == "geometry"
+
+    # Deduplicated and sorted by ("Vorhaben", "Name der WKA")
+    assert len(gdf) == 3
+    assert gdf["Vorhaben"].tolist() == ["Windpark A", "Windpark B", "Windpark B"]
+    assert gdf["Name der WKA"].tolist() == ["WKA 1", "WKA 1", "WKA 2"]
+    assert gdf["Stand"].tolist() == ["08.08.2026"] * 3
+
+    # Padded category strings are stripped
+    assert gdf["Rechtsmaterie"].cat.categories.tolist() == ["NÖ ElWG"]
+    assert gdf["Betreiber"].cat.categories.tolist() == ["Windkraft GmbH"]
+
+    # Decimal commas and dd.mm.YYYY dates
+    np.testing.assert_array_equal(gdf["Leistung der WKA [MW]"], [5.56] * 3)
+    np.testing.assert_array_equal(gdf["Gesamthöhe der WKA [m]"], [246.6] * 3)
+    assert (gdf["Datum Genehmigungsantrag"] == pd.Timestamp("2025-09-08")).all()
+    assert gdf["Datum Fertigstellungsmeldung"].isna().tolist() == [True, False, True]
+    assert gdf["Datum Fertigstellungsmeldung"].iloc[1] == pd.Timestamp("2026-02-01")
+
+    # Coordinates come from the geometry, so the null-geometry feature has none
+    assert gdf.geometry.isna().tolist() == [True, False, False]
+    np.testing.assert_array_equal(gdf["Koordinaten Länge [WGS 84]"], [np.nan, 15.7, 15.668572])
+    np.testing.assert_array_equal(gdf["Koordinaten Breite [WGS 84]"], [np.nan, 48.3, 48.202875])
+
+
+def test_parse_noe_geojson_null_properties_fail_fast():
+    feature = _feature(15.7, 48.3)
+    content = _payload(feature, feature | {"properties": None})
+    with pytest.raises(ValueError):
+        parse_noe_geojson(content)